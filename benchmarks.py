@@ -0,0 +1,420 @@
+# Course:       CS261 - Data Structures
+# Description:  Benchmarks for the MinHeap class and the heapsort function,
+#               for RadixMinHeap against MinHeap on monotone workloads,
+#               and for parallel_heapsort against the serial heapsort.
+#               The suite times MinHeap, heapsort and DynamicArray against heapq, sorted() and list
+#               on several input distributions, and can save its results as JSON to track regressions.
+#               Run this file directly to print the results, e.g.:
+#                   python benchmarks.py
+#                   python benchmarks.py 1000 10000 100000
+#                   python benchmarks.py --suite --json results.json 1000 10000 100000 1000000 10000000
+
+import argparse
+import heapq
+import json
+import os
+import platform
+import random
+import time
+
+from dynamic_array import DynamicArray
+from min_heap import MinHeap, heapsort
+from parallel_heapsort import parallel_heapsort
+from radix_min_heap import RadixMinHeap
+
+
+ARITIES = (2, 3, 4, 8)
+
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "duplicates")
+
+# Number of insert_at_index() and remove_at_index() calls, and of slice() calls, timed per size.
+# Each of them is O(n), so the array workloads do a fixed number of calls rather than n of them
+POINT_OPERATIONS = 100
+SLICE_OPERATIONS = 10
+
+
+def time_call(func, repeat: int = 3, setup=None) -> float:
+    """
+    Returns the best wall-clock time, in seconds, out of several calls of func.
+    If setup is specified, it is called before each timed call, untimed, and its result is passed to func.
+    """
+    best = None
+    for _ in range(repeat):
+        if setup is None:
+            start = time.perf_counter()
+            func()
+        else:
+            state = setup()
+            start = time.perf_counter()
+            func(state)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def add_heavy(values: list, arity: int) -> None:
+    """
+    Adds every value, then removes a tenth of them.
+    """
+    heap = MinHeap(arity=arity)
+    for value in values:
+        heap.add(value)
+    for _ in range(len(values) // 10):
+        heap.remove_min()
+
+
+def add_remove(values: list, arity: int) -> None:
+    """
+    Adds every value, then removes all of them.
+    """
+    heap = MinHeap(arity=arity)
+    for value in values:
+        heap.add(value)
+    while not heap.is_empty():
+        heap.remove_min()
+
+
+def sort_array(values: list, arity: int) -> None:
+    """
+    Heapsorts a DynamicArray holding the values.
+    """
+    heapsort(DynamicArray.adopt(list(values)), arity=arity, engine='heap')
+
+
+def bench_arity(sizes, seed: int = 261) -> list:
+    """
+    Times each workload for every arity in ARITIES and every size.
+    Returns a list of (workload, size, {arity: seconds}) tuples.
+    """
+    workloads = (("add_heavy", add_heavy), ("add_remove", add_remove), ("heapsort", sort_array))
+    results = []
+    for size in sizes:
+        values = random.Random(seed).sample(range(size * 10), size)
+        for name, workload in workloads:
+            timings = {}
+            for arity in ARITIES:
+                timings[arity] = time_call(lambda: workload(values, arity))
+            results.append((name, size, timings))
+    return results
+
+
+def print_arity_report(results: list) -> None:
+    """
+    Prints each timing relative to the binary layout, followed by the fastest arity for each row.
+    A ratio below 1.00 means the wider layout beat the binary one.
+    """
+    header = f"{'workload':<12}{'size':>10}" + "".join(f"{'d=' + str(arity):>10}" for arity in ARITIES)
+    print(header + f"{'fastest':>10}")
+    for name, size, timings in results:
+        row = f"{name:<12}{size:>10}"
+        for arity in ARITIES:
+            row += f"{timings[arity] / timings[2]:>10.2f}"
+        fastest = min(timings, key=timings.get)
+        print(row + f"{'d=' + str(fastest):>10}")
+
+
+def event_simulation(heap_class, start_times: list, delays: list) -> None:
+    """
+    Monotone workload of a discrete event simulator: seeds the heap with the start times,
+    then repeatedly pops the next event and schedules a follow-up event after a delay, and finally drains the heap.
+    """
+    heap = heap_class()
+    for start_time in start_times:
+        heap.add(start_time)
+    for delay in delays:
+        heap.add(heap.remove_min() + delay)
+    while not heap.is_empty():
+        heap.remove_min()
+
+
+def bench_radix(sizes, seed: int = 261) -> list:
+    """
+    Times the event simulation on MinHeap and on RadixMinHeap for every size,
+    with as many follow-up events as start times.
+    Returns a list of (size, MinHeap seconds, RadixMinHeap seconds) tuples.
+    """
+    results = []
+    for size in sizes:
+        rng = random.Random(seed)
+        start_times = [rng.randrange(1000) for _ in range(size)]
+        delays = [rng.randrange(1, 1000) for _ in range(size)]
+        results.append((size,
+                        time_call(lambda: event_simulation(MinHeap, start_times, delays)),
+                        time_call(lambda: event_simulation(RadixMinHeap, start_times, delays))))
+    return results
+
+
+def print_radix_report(results: list) -> None:
+    """
+    Prints the time of each heap and the speedup of RadixMinHeap over MinHeap.
+    """
+    print(f"{'size':>10}{'MinHeap':>12}{'Radix':>12}{'speedup':>10}")
+    for size, heap_time, radix_time in results:
+        print(f"{size:>10}{heap_time:>11.3f}s{radix_time:>11.3f}s{heap_time / radix_time:>10.2f}")
+
+
+def bench_parallel(sizes, workers: int = None, seed: int = 261) -> list:
+    """
+    Times the serial heapsort and parallel_heapsort, with the serial fallback disabled, on random floats.
+    The size from which the parallel sort wins is a good value for PARALLEL_THRESHOLD on this machine.
+    Returns a list of (size, serial seconds, parallel seconds) tuples.
+    """
+    results = []
+    for size in sizes:
+        rng = random.Random(seed)
+        values = [rng.random() for _ in range(size)]
+        results.append((size,
+                        time_call(lambda: heapsort(DynamicArray.adopt(list(values)), engine='heap')),
+                        time_call(lambda: parallel_heapsort(DynamicArray.adopt(list(values)),
+                                                            workers=workers, threshold=0))))
+    return results
+
+
+def print_parallel_report(results: list) -> None:
+    """
+    Prints the time of each sort and the speedup of parallel_heapsort over heapsort.
+    """
+    print(f"{'size':>10}{'serial':>12}{'parallel':>12}{'speedup':>10}")
+    for size, serial_time, parallel_time in results:
+        print(f"{size:>10}{serial_time:>11.3f}s{parallel_time:>11.3f}s{serial_time / parallel_time:>10.2f}")
+
+
+def make_values(distribution: str, size: int, seed: int = 261) -> list:
+    """
+    Returns a reproducible list of ints of the specified size and distribution:
+    'random', 'sorted', 'reversed', or 'duplicates' (about 100 copies of each value).
+    """
+    rng = random.Random(seed)
+    if distribution == "duplicates":
+        return [rng.randrange(max(size // 100, 1)) for _ in range(size)]
+
+    values = [rng.randrange(size * 10) for _ in range(size)]
+    if distribution == "sorted":
+        values.sort()
+    elif distribution == "reversed":
+        values.sort(reverse=True)
+    elif distribution != "random":
+        raise ValueError(f"Unknown distribution {distribution!r}")
+    return values
+
+
+def heapify_copy(values: list) -> list:
+    """
+    Returns a heapq heap holding the values.
+    """
+    heap = list(values)
+    heapq.heapify(heap)
+    return heap
+
+
+def drain_min_heap(heap: MinHeap) -> None:
+    """
+    Removes every value of the heap.
+    """
+    while not heap.is_empty():
+        heap.remove_min()
+
+
+def drain_heapq(heap: list) -> None:
+    """
+    Pops every value of a heapq heap.
+    """
+    while heap:
+        heapq.heappop(heap)
+
+
+def fill_min_heap(values: list) -> None:
+    """
+    Adds every value to a new MinHeap.
+    """
+    heap = MinHeap()
+    for value in values:
+        heap.add(value)
+
+
+def fill_heapq(values: list) -> None:
+    """
+    Pushes every value to a new heapq heap.
+    """
+    heap = []
+    for value in values:
+        heapq.heappush(heap, value)
+
+
+def fill_dynamic_array(values: list) -> None:
+    """
+    Appends every value to a new DynamicArray.
+    """
+    array = DynamicArray()
+    for value in values:
+        array.append(value)
+
+
+def fill_list(values: list) -> None:
+    """
+    Appends every value to a new list.
+    """
+    array = []
+    for value in values:
+        array.append(value)
+
+
+def heap_cases(values: list) -> list:
+    """
+    Returns the (benchmark, implementation, operations, setup, run) cases timed on every distribution.
+    Every case processes each value once.
+    """
+    size = len(values)
+    return [
+        ("add", "MinHeap", size, lambda: values, fill_min_heap),
+        ("add", "heapq", size, lambda: values, fill_heapq),
+        ("remove_min", "MinHeap", size, lambda: MinHeap.from_iterable(values), drain_min_heap),
+        ("remove_min", "heapq", size, lambda: heapify_copy(values), drain_heapq),
+        ("build_heap", "MinHeap", size, lambda: DynamicArray.adopt(list(values)),
+         lambda array: MinHeap().build_heap(array, copy=False)),
+        ("build_heap", "heapq", size, lambda: list(values), heapq.heapify),
+        ("heapsort", "heapsort", size, lambda: DynamicArray.adopt(list(values)),
+         lambda array: heapsort(array, engine="heap")),
+        ("heapsort", "sorted", size, lambda: values, lambda array: sorted(array, reverse=True)),
+    ]
+
+
+def array_cases(values: list, seed: int = 261) -> list:
+    """
+    Returns the (benchmark, implementation, operations, setup, run) cases of the DynamicArray operations,
+    which do not depend on the distribution. Every call uses the same reproducible indices.
+    """
+    rng = random.Random(seed)
+    size = len(values)
+    operations = min(POINT_OPERATIONS, size // 2)
+    insert_indices = [rng.randrange(size + 1) for _ in range(operations)]
+    remove_indices = [rng.randrange(size - operations) for _ in range(operations)]
+    slice_starts = [rng.randrange(size - size // 2) for _ in range(SLICE_OPERATIONS)]
+
+    def insert_dynamic_array(array: DynamicArray) -> None:
+        for index in insert_indices:
+            array.insert_at_index(index, 0)
+
+    def insert_list(array: list) -> None:
+        for index in insert_indices:
+            array.insert(index, 0)
+
+    def remove_dynamic_array(array: DynamicArray) -> None:
+        for index in remove_indices:
+            array.remove_at_index(index)
+
+    def remove_list(array: list) -> None:
+        for index in remove_indices:
+            del array[index]
+
+    def slice_dynamic_array(array: DynamicArray) -> None:
+        for start in slice_starts:
+            array.slice(start, size // 2)
+
+    def slice_list(array: list) -> None:
+        for start in slice_starts:
+            array[start:start + size // 2]
+
+    return [
+        ("append", "DynamicArray", size, lambda: values, fill_dynamic_array),
+        ("append", "list", size, lambda: values, fill_list),
+        ("insert_at_index", "DynamicArray", operations, lambda: DynamicArray.adopt(list(values)),
+         insert_dynamic_array),
+        ("insert_at_index", "list", operations, lambda: list(values), insert_list),
+        ("remove_at_index", "DynamicArray", operations, lambda: DynamicArray.adopt(list(values)),
+         remove_dynamic_array),
+        ("remove_at_index", "list", operations, lambda: list(values), remove_list),
+        ("slice", "DynamicArray", SLICE_OPERATIONS, lambda: DynamicArray.adopt(list(values)), slice_dynamic_array),
+        ("slice", "list", SLICE_OPERATIONS, lambda: list(values), slice_list),
+    ]
+
+
+def run_suite(sizes, distributions=DISTRIBUTIONS, repeat: int = 3, seed: int = 261, progress=None) -> dict:
+    """
+    Times every heap case on every distribution and every array case on random values, for every size.
+    Returns a JSON-serializable dict with the run's metadata and a list of results, one per timing.
+
+    progress: optional function called with each result as soon as it is measured
+    """
+    results = []
+
+    def measure(benchmark, implementation, distribution, size, operations, setup, run):
+        result = {
+            "benchmark": benchmark,
+            "implementation": implementation,
+            "distribution": distribution,
+            "size": size,
+            "operations": operations,
+            "seconds": time_call(run, repeat, setup),
+        }
+        results.append(result)
+        if progress is not None:
+            progress(result)
+
+    for size in sizes:
+        for distribution in distributions:
+            values = make_values(distribution, size, seed)
+            for case in heap_cases(values):
+                measure(case[0], case[1], distribution, size, *case[2:])
+
+        values = make_values("random", size, seed)
+        for case in array_cases(values, seed):
+            measure(case[0], case[1], "random", size, *case[2:])
+
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def print_suite_result(result: dict) -> None:
+    """
+    Prints one suite result as a table row.
+    """
+    print(f"{result['benchmark']:<16}{result['implementation']:<14}{result['distribution']:<12}"
+          f"{result['size']:>10}{result['seconds']:>12.4f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MinHeap, heapsort and DynamicArray benchmarks")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 10000, 100000],
+                        help="input sizes (default: 1000 10000 100000)")
+    parser.add_argument("--suite", action="store_true",
+                        help="run the benchmark suite against heapq, sorted() and list instead of the reports")
+    parser.add_argument("--json", metavar="PATH", help="also write the suite results as JSON to this file")
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS),
+                        help="input distributions of the suite (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best one is kept")
+    parser.add_argument("--seed", type=int, default=261, help="seed of the generated inputs")
+    args = parser.parse_args()
+    sizes = args.sizes
+
+    if args.suite:
+        print(f"\n{'benchmark':<16}{'impl':<14}{'input':<12}{'size':>10}{'best':>13}")
+        print("-" * 65)
+        report = run_suite(sizes, args.distributions, args.repeat, args.seed, progress=print_suite_result)
+        if args.json:
+            with open(args.json, "w") as file:
+                json.dump(report, file, indent=2)
+    else:
+        print("\nMinHeap arity - time relative to d=2")
+        print("------------------------------------")
+        print_arity_report(bench_arity(sizes))
+
+        print("\nMonotone event simulation - MinHeap vs RadixMinHeap")
+        print("---------------------------------------------------")
+        print_radix_report(bench_radix(sizes))
+
+        print("\nheapsort vs parallel_heapsort")
+        print("-----------------------------")
+        print_parallel_report(bench_parallel(sizes))
@@ -4,9 +4,25 @@
 # Assignment: 2
 # Due Date: 07/16/2024
 # Description: Created a DynamicArray class with several methods defined as required by the assignment instructions.
+#              Arrays can also be saved to and restored from compact binary snapshots with dump() and load().
+
+import mmap
+import pickle
+import struct
+import sys
+from array import array
 
 from static_array import StaticArray
 
+# Snapshot header: magic, format version, element kind, byte order, element count and payload size.
+# The kind is 'q' or 'd' for arrays of only 64-bit ints or only floats, stored as a raw typed buffer,
+# and 'o' for any other array, stored as a protocol 5 pickle followed by its out-of-band buffers
+_SNAPSHOT_HEADER = struct.Struct('<8sHcc4xqq')
+_SNAPSHOT_MAGIC = b'DYNARRAY'
+_SNAPSHOT_VERSION = 1
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+_LENGTH = struct.Struct('<q')
+
 
 class DynamicArrayException(Exception):
     """
@@ -17,6 +33,9 @@ class DynamicArrayException(Exception):
 
 
 class DynamicArray:
+    # Metrics counting this array's resizes, set by enable_metrics()
+    _metrics = None
+
     def __init__(self, start_array=None):
         """
         Initialize new dynamic array
@@ -195,18 +214,7 @@ class DynamicArray:
         # we lessen the capacity to twice the number of existing elements
         if self._capacity / 4 > self._size and self._capacity > 10:
             # The reduced capacity cannot become less than 10 elements.
-            if self._size * 2 < 10:
-                new_array = StaticArray(10)
-                self._capacity = 10
-            else:
-                new_array = StaticArray(self._size * 2)
-                self._capacity = self._size * 2
-
-            # Copy existing elements in new array and set it equal to the current object's data attribute
-            for num in range(self._size):
-                element = self._data.get(num)
-                new_array.set(num, element)
-            self._data = new_array
+            self.resize(max(self._size * 2, 10))
 
         # Set the removed element's index value equal to None
         self._data.set(index, None)
@@ -220,6 +228,24 @@ class DynamicArray:
         # Decrement the current object's size attribute
         self._size -= 1
 
+    def truncate(self, new_size: int) -> None:
+        """
+        Removes all elements from the specified size onwards, shrinking the capacity at most once.
+        """
+        # Valid sizes are [0, N] inclusive.
+        if new_size < 0 or new_size > self._size:
+            raise DynamicArrayException
+
+        # Clear the removed elements and update the current object's size attribute
+        for num in range(new_size, self._size):
+            self._data.set(num, None)
+        self._size = new_size
+
+        # Same rule as remove_at_index(): if number of elements is < 1/4 of the capacity AND capacity > 10,
+        # we lessen the capacity to twice the number of remaining elements, but not below 10
+        if self._capacity / 4 > self._size and self._capacity > 10:
+            self.resize(max(self._size * 2, 10))
+
     def slice(self, start_index: int, size: int) -> "DynamicArray":
         """
         Returns a sliced array.
@@ -300,6 +326,184 @@ class DynamicArray:
 
         return initializer
 
+    @classmethod
+    def adopt(cls, values: list) -> "DynamicArray":
+        """
+        Returns a new array that takes over the specified list as its storage, without copying its elements.
+        The list should not be used by the caller afterwards.
+        """
+        new_array = cls()
+        if len(values) == 0:
+            return new_array
+
+        # StaticArray only allocates lists of None, so we hand it the existing list directly
+        storage = StaticArray(1)
+        storage._size = len(values)
+        storage._data = values
+
+        new_array._data = storage
+        new_array._size = len(values)
+        new_array._capacity = len(values)
+        return new_array
+
+    def overwrite(self, values: list) -> None:
+        """
+        Replaces every element of the array, in order, with the elements of the specified list in one bulk copy.
+        The list must have the same length as the array.
+        """
+        if len(values) != self._size:
+            raise DynamicArrayException
+        self._data._data[:self._size] = values
+
+    def to_list(self) -> list:
+        """
+        Returns a built-in list holding a shallow copy of the array's elements, copied in bulk.
+        """
+        return self._data._data[:self._size]
+
+    def enable_metrics(self, metrics) -> None:
+        """
+        Records every resize of this array, with the number of elements it copies, in the specified
+        HeapMetrics (see heap_metrics.py). An instrumented resize() is installed on this array only,
+        so other arrays keep the plain method.
+        """
+        def measured_resize(new_capacity: int) -> None:
+            capacity = self._capacity
+            type(self).resize(self, new_capacity)
+            if self._capacity != capacity:
+                metrics.record_resize(self._size)
+
+        self.resize = measured_resize
+        self._metrics = metrics
+
+    def disable_metrics(self) -> None:
+        """
+        Stops recording resizes and restores the plain resize() method.
+        """
+        vars(self).pop('resize', None)
+        vars(self).pop('_metrics', None)
+
+    def dump(self, fp) -> None:
+        """
+        Writes a binary snapshot of the array to the specified binary file.
+        Arrays of only ints that fit in 64 bits or only floats are written as a raw typed buffer,
+        and other arrays are pickled with protocol 5, with out-of-band buffers written raw.
+        """
+        _write_snapshot(fp, self.to_list())
+
+    @classmethod
+    def load(cls, fp, memory_map: bool = False) -> "DynamicArray":
+        """
+        Returns the array stored in the snapshot at the current position of the specified binary file,
+        and moves the file position past the snapshot.
+
+        memory_map: if True, the snapshot is read through a memory map of the file instead of being copied
+                    into memory first. Objects restored from out-of-band buffers (such as NumPy arrays)
+                    then share the mapped pages, read-only, and keep the mapping open
+        """
+        return cls.adopt(_read_snapshot(fp, memory_map))
+
+
+def array_typecode(values: list):
+    """
+    Returns the array.array typecode holding every value exactly in 8 bytes: 'q' for only ints
+    that fit in 64 bits, 'd' for only floats, or None for any other (or an empty) list of values.
+    """
+    value_types = set(map(type, values))
+    if value_types == {float}:
+        return 'd'
+    if value_types == {int} and -2 ** 63 <= min(values) and max(values) < 2 ** 63:
+        return 'q'
+    return None
+
+
+def _write_snapshot(fp, values: list) -> None:
+    """
+    Writes a snapshot of the values to the binary file: a header followed by the payload.
+    """
+    typecode = array_typecode(values)
+    if typecode is not None:
+        payload = [array(typecode, values)]
+        kind = typecode.encode()
+    else:
+        # Objects supporting out-of-band pickling hand over their buffers instead of copying them into the pickle
+        buffers = []
+        data = pickle.dumps(values, protocol=5, buffer_callback=buffers.append)
+        payload = [_LENGTH.pack(len(data)), data, _LENGTH.pack(len(buffers))]
+        for buffer in buffers:
+            raw = buffer.raw()
+            payload += [_LENGTH.pack(raw.nbytes), raw]
+        kind = b'o'
+
+    payload_size = sum(memoryview(part).nbytes for part in payload)
+    fp.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, kind, _BYTE_ORDER, len(values), payload_size))
+    for part in payload:
+        fp.write(part)
+
+
+def _read_snapshot(fp, memory_map: bool = False) -> list:
+    """
+    Reads a snapshot written by _write_snapshot() at the current position of the binary file,
+    leaving the file position right after it, and returns its values as a list.
+    """
+    header = fp.read(_SNAPSHOT_HEADER.size)
+    if len(header) != _SNAPSHOT_HEADER.size:
+        raise DynamicArrayException('Truncated snapshot')
+    magic, version, kind, byte_order, count, payload_size = _SNAPSHOT_HEADER.unpack(header)
+    if magic != _SNAPSHOT_MAGIC:
+        raise DynamicArrayException('Not a DynamicArray snapshot')
+    if version != _SNAPSHOT_VERSION:
+        raise DynamicArrayException(f'Unsupported snapshot version {version}')
+
+    # The payload is either mapped or read into memory, and parsed through the same memoryview
+    start = fp.tell()
+    if memory_map:
+        mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        payload = memoryview(mapping)[start:start + payload_size]
+        fp.seek(start + payload_size)
+    else:
+        # A bytearray keeps objects restored from out-of-band buffers writable
+        mapping = None
+        payload = memoryview(bytearray(payload_size))
+        if fp.readinto(payload) != payload_size:
+            raise DynamicArrayException('Truncated snapshot')
+    if payload.nbytes != payload_size:
+        raise DynamicArrayException('Truncated snapshot')
+
+    if kind != b'o':
+        typecode = kind.decode()
+        if byte_order == _BYTE_ORDER:
+            values = payload.cast(typecode).tolist()
+        else:
+            swapped = array(typecode, payload)
+            swapped.byteswap()
+            values = swapped.tolist()
+    else:
+        offset = _LENGTH.size
+        data_end = offset + _LENGTH.unpack_from(payload, 0)[0]
+        buffer_count = _LENGTH.unpack_from(payload, data_end)[0]
+        offset = data_end + _LENGTH.size
+
+        buffers = []
+        for _ in range(buffer_count):
+            buffer_size = _LENGTH.unpack_from(payload, offset)[0]
+            offset += _LENGTH.size
+            buffers.append(payload[offset:offset + buffer_size])
+            offset += buffer_size
+        values = pickle.loads(payload[_LENGTH.size:data_end], buffers=buffers)
+
+    if len(values) != count:
+        raise DynamicArrayException('Corrupted snapshot')
+
+    # A mapping still shared with restored objects stays open until they are gone
+    payload.release()
+    if mapping is not None:
+        try:
+            mapping.close()
+        except BufferError:
+            pass
+    return values
+
 
 def find_mode(arr: DynamicArray) -> tuple[DynamicArray, int]:
     """
@@ -0,0 +1,238 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines external_sort(), which sorts a file of line records that may be larger than memory.
+#               Sorted runs are produced by replacement selection with a MinHeap, then k-way merged
+#               with merge_sorted(), which holds one cursor per run in a second MinHeap. When there are
+#               too many runs to open at once, groups of them are first merged into longer runs.
+
+import os
+import sys
+import tempfile
+from operator import itemgetter
+
+from min_heap import MinHeap, MinHeapException, merge_sorted
+
+
+# Rough per-record memory cost on top of the record's own bytes: the bytes object header,
+# the heap entry tuple and the pointers to both in the heap's arrays
+_RECORD_OVERHEAD = sys.getsizeof(b'') + sys.getsizeof((0, 0, 0)) + 3 * 8
+
+# Number of output records collected before each bulk write
+_WRITE_BATCH = 4096
+
+# Smallest read or write buffer. open() would take a buffer of 1 byte as a request for line buffering,
+# which binary files do not support, and smaller buffers make every read a system call
+_MIN_BUFFER = 4096
+
+# The open-file limit is only known on Unix. Elsewhere, a merge opens at most _DEFAULT_OPEN_FILES runs
+try:
+    import resource
+except ImportError:
+    resource = None
+_DEFAULT_OPEN_FILES = 256
+
+
+def external_sort(input_path: str, output_path: str, memory_budget: int = 64 * 1024 * 1024,
+                  key=None, temp_dir: str = None) -> int:
+    """
+    Sorts the newline-separated records of the input file in ascending order into the output file.
+    Returns the number of records sorted.
+
+    memory_budget: approximate number of bytes of records to hold in memory at once
+    key: optional function computing the sort key of a record (a bytes object without its newline)
+    temp_dir: directory for the temporary run files, the system default if None
+    """
+    if memory_budget < 1:
+        raise MinHeapException('Memory budget must be a positive number of bytes')
+    if key is None:
+        key = _identity
+
+    with tempfile.TemporaryDirectory(dir=temp_dir) as run_dir:
+        run_paths, count = _make_runs(input_path, run_dir, memory_budget, key)
+        _merge_runs(run_paths, output_path, run_dir, memory_budget, key)
+
+    return count
+
+
+def _identity(record: bytes) -> bytes:
+    """
+    Default sort key: the record itself.
+    """
+    return record
+
+
+def _read_records(path: str, buffer_size: int):
+    """
+    Yields the records of a file, without their newlines, reading it through a buffer of the specified size.
+    """
+    with open(path, 'rb', buffering=buffer_size) as file:
+        for line in file:
+            if line.endswith(b'\n'):
+                line = line[:-1]
+            yield line
+
+
+class _RecordWriter:
+    """
+    Writes records to a file in batches, adding a newline after each record.
+    """
+
+    def __init__(self, path: str, buffer_size: int):
+        """
+        Open the file at the specified path for writing.
+        """
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._batch = []
+
+    def write(self, record: bytes) -> None:
+        """
+        Queues a record, writing the queued records once a full batch has been collected.
+        """
+        self._batch.append(record)
+        if len(self._batch) == _WRITE_BATCH:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Writes the remaining queued records and closes the file.
+        """
+        self._flush()
+        self._file.close()
+
+    def _flush(self) -> None:
+        """
+        Writes the queued records in one call.
+        """
+        if self._batch:
+            self._file.write(b'\n'.join(self._batch) + b'\n')
+            self._batch = []
+
+
+def _make_runs(input_path: str, run_dir: str, memory_budget: int, key) -> tuple:
+    """
+    Splits the input file into sorted run files using replacement selection.
+    Returns the list of run file paths and the number of records.
+
+    The heap holds (run number, sort key, record) entries. A record read from the input joins the current run
+    if its key is not smaller than the last one written, and the next run otherwise, so on random input the
+    runs are about twice as long as the number of records that fit in memory.
+    """
+    records = _read_records(input_path, max(min(memory_budget, 1024 * 1024), _MIN_BUFFER))
+    heap = MinHeap(key=itemgetter(0, 1))
+
+    # Fill the heap up to the memory budget
+    used = 0
+    for record in records:
+        heap.add((0, key(record), record))
+        used += len(record) + _RECORD_OVERHEAD
+        if used >= memory_budget:
+            break
+
+    run_paths = []
+    writer = None
+    current_run = -1
+    count = 0
+    while not heap.is_empty():
+        run, record_key, record = heap.get_min()
+
+        # Start a new run file once every entry of the current run has been written
+        if run != current_run:
+            if writer is not None:
+                writer.close()
+            run_paths.append(os.path.join(run_dir, f'run{len(run_paths)}'))
+            writer = _RecordWriter(run_paths[-1], 1024 * 1024)
+            current_run = run
+
+        writer.write(record)
+        count += 1
+
+        # Replace the written entry with the next input record, if any, using a single sift
+        next_record = next(records, None)
+        if next_record is None:
+            heap.remove_min()
+        else:
+            next_key = key(next_record)
+            next_run = run if not next_key < record_key else run + 1
+            heap.replace((next_run, next_key, next_record))
+
+    if writer is not None:
+        writer.close()
+    return run_paths, count
+
+
+def _merge_runs(run_paths: list, output_path: str, run_dir: str, memory_budget: int, key) -> None:
+    """
+    Merges the sorted run files into the output file, in as many passes as the maximum fan-in requires.
+
+    A merge holds one open file and one read buffer of at least _MIN_BUFFER bytes per run, plus the output
+    buffer, so the fan-in is capped by both the memory budget and the open-file limit. While there are more
+    runs than that, each pass merges groups of them into intermediate runs, deleting the merged ones.
+    """
+    fan_in = _max_fan_in(memory_budget)
+    merge_pass = 0
+    while len(run_paths) > fan_in:
+        # We split the runs into as few groups as the fan-in allows, of about the same size
+        groups = -(-len(run_paths) // fan_in)
+        merged_paths = []
+        for group in range(groups):
+            group_paths = run_paths[len(run_paths) * group // groups:len(run_paths) * (group + 1) // groups]
+            merged_paths.append(os.path.join(run_dir, f'merge{merge_pass}_{group}'))
+            _merge_group(group_paths, merged_paths[-1], memory_budget, key)
+            for path in group_paths:
+                os.remove(path)
+
+        run_paths = merged_paths
+        merge_pass += 1
+
+    _merge_group(run_paths, output_path, memory_budget, key)
+
+
+def _max_fan_in(memory_budget: int) -> int:
+    """
+    Returns the largest number of runs to merge at once: the number of read buffers that fit in the budget
+    next to the output buffer, and at most half the open-file limit, leaving the rest to the rest of
+    the process. At least two runs are always merged at once, even if their buffers exceed a tiny budget.
+    """
+    open_files = _DEFAULT_OPEN_FILES
+    if resource is not None:
+        soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        if soft_limit != resource.RLIM_INFINITY:
+            open_files = soft_limit
+
+    return max(min(memory_budget // _MIN_BUFFER - 1, open_files // 2), 2)
+
+
+def _merge_group(run_paths: list, output_path: str, memory_budget: int, key) -> None:
+    """
+    Merges the sorted run files into one file with merge_sorted(), which holds one cursor per run.
+    The memory budget is split between the read buffers of the runs and the output buffer.
+    """
+    buffer_size = max(memory_budget // (len(run_paths) + 1), _MIN_BUFFER)
+    cursors = [_read_records(path, buffer_size) for path in run_paths]
+    writer = _RecordWriter(output_path, buffer_size)
+
+    for record in merge_sorted(*cursors, key=key):
+        writer.write(record)
+
+    writer.close()
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+    import random
+
+    print("\nexternal_sort example 1")
+    print("-----------------------")
+    work_dir = tempfile.mkdtemp()
+    input_path = os.path.join(work_dir, 'input.txt')
+    output_path = os.path.join(work_dir, 'output.txt')
+
+    values = [random.randint(0, 10 ** 6) for _ in range(10000)]
+    with open(input_path, 'w') as file:
+        file.write('\n'.join(str(value) for value in values) + '\n')
+
+    count = external_sort(input_path, output_path, memory_budget=20000, key=int)
+    with open(output_path) as file:
+        result = [int(line) for line in file]
+    print(count, result == sorted(values))
@@ -0,0 +1,66 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines HeapMetrics, the counters collected by a MinHeap and its DynamicArrays
+#               while their metrics are enabled.
+
+
+class HeapMetrics:
+    """
+    Comparison, swap, sift depth and resize counters of an instrumented MinHeap.
+
+    The heap and its arrays only update these counters through the instrumented methods that
+    enable_metrics() installs, so a heap without metrics runs its plain methods and pays nothing.
+    An optional callback is called as callback(event, value) after every sift, with event 'sift'
+    and the number of levels the value moved, and after every resize, with event 'resize' and
+    the number of elements copied.
+    """
+
+    def __init__(self, callback=None):
+        """
+        Initialize a new HeapMetrics with every counter at zero
+        """
+        self._callback = callback
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Sets every counter back to zero.
+        """
+        self.comparisons = 0
+        self.swaps = 0
+        self.sift_depths = {}
+        self.resizes = 0
+        self.elements_copied = 0
+        self.largest_copy = 0
+
+    def record_sift(self, depth: int) -> None:
+        """
+        Records a sift that moved a value by the specified number of levels.
+        """
+        self.sift_depths[depth] = self.sift_depths.get(depth, 0) + 1
+        if self._callback is not None:
+            self._callback('sift', depth)
+
+    def record_resize(self, copied: int) -> None:
+        """
+        Records a resize that copied the specified number of elements.
+        """
+        self.resizes += 1
+        self.elements_copied += copied
+        if copied > self.largest_copy:
+            self.largest_copy = copied
+        if self._callback is not None:
+            self._callback('resize', copied)
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the counters as a dict. sift_depths maps each depth to its number of sifts.
+        """
+        return {
+            'comparisons': self.comparisons,
+            'swaps': self.swaps,
+            'sifts': sum(self.sift_depths.values()),
+            'sift_depths': dict(sorted(self.sift_depths.items())),
+            'resizes': self.resizes,
+            'elements_copied': self.elements_copied,
+            'largest_copy': self.largest_copy,
+        }
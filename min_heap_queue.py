@@ -0,0 +1,366 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines MinHeapQueue, a thread-safe blocking priority queue built on top of MinHeap,
+#               and AsyncMinHeapQueue, its asyncio counterpart.
+#               Their interfaces follow the standard library's queue.Queue and asyncio.Queue.
+
+import asyncio
+import collections
+import threading
+import time
+from queue import Empty, Full
+
+from dynamic_array import DynamicArray
+from min_heap import MinHeap
+
+
+class MinHeapQueue:
+    """
+    Thread-safe priority queue that always hands out its smallest item first.
+
+    A single lock guards the underlying MinHeap and is only held while the heap is read or changed.
+    Threads waiting for an item or for free space sleep on condition variables, which release the lock.
+    """
+
+    def __init__(self, maxsize: int = 0, arity: int = 2, key=None):
+        """
+        Initialize a new MinHeapQueue
+
+        maxsize: maximum number of queued items, or 0 (or less) for an unbounded queue
+        arity, key: passed on to the underlying MinHeap
+        """
+        self._maxsize = maxsize
+        self._heap = MinHeap(arity=arity, key=key)
+
+        # All three conditions share the same lock
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_tasks_done = threading.Condition(self._mutex)
+        self._unfinished_tasks = 0
+
+    def put(self, item: object, block: bool = True, timeout: float = None) -> None:
+        """
+        Adds an item to the queue.
+        If the queue is full, waits for free space (up to timeout seconds) unless block is False,
+        and raises queue.Full if none becomes available.
+        """
+        with self._not_full:
+            if self._maxsize > 0:
+                self._wait(self._not_full, lambda: self._heap.size() < self._maxsize, block, timeout, Full)
+
+            self._heap.add(item)
+            self._unfinished_tasks += 1
+            self._not_empty.notify()
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Adds an item to the queue without waiting. Raises queue.Full if the queue is full.
+        """
+        self.put(item, block=False)
+
+    def get(self, block: bool = True, timeout: float = None) -> object:
+        """
+        Removes and returns the smallest item of the queue.
+        If the queue is empty, waits for an item (up to timeout seconds) unless block is False,
+        and raises queue.Empty if none arrives.
+        """
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: not self._heap.is_empty(), block, timeout, Empty)
+
+            item = self._heap.remove_min()
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self) -> object:
+        """
+        Removes and returns the smallest item without waiting. Raises queue.Empty if the queue is empty.
+        """
+        return self.get(block=False)
+
+    def get_many(self, max_items: int, block: bool = True, timeout: float = None) -> DynamicArray:
+        """
+        Removes and returns up to max_items of the smallest items, in ascending order, in one lock handoff.
+        Waits like get() for at least one item, then takes whatever is available up to max_items.
+        """
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: not self._heap.is_empty(), block, timeout, Empty)
+
+            items = self._heap.remove_min_many(max_items)
+            self._not_full.notify(items.length())
+            return items
+
+    def task_done(self) -> None:
+        """
+        Marks one previously retrieved item as fully processed.
+        Raises ValueError if called more times than there were items put in the queue.
+        """
+        with self._all_tasks_done:
+            if self._unfinished_tasks <= 0:
+                raise ValueError('task_done() called too many times')
+
+            self._unfinished_tasks -= 1
+            if self._unfinished_tasks == 0:
+                self._all_tasks_done.notify_all()
+
+    def join(self) -> None:
+        """
+        Blocks until every item put in the queue has been retrieved and marked with task_done().
+        """
+        with self._all_tasks_done:
+            while self._unfinished_tasks:
+                self._all_tasks_done.wait()
+
+    def qsize(self) -> int:
+        """
+        Returns the number of queued items. The value may be stale as soon as it is returned.
+        """
+        with self._mutex:
+            return self._heap.size()
+
+    def empty(self) -> bool:
+        """
+        Returns True if the queue is empty. The value may be stale as soon as it is returned.
+        """
+        with self._mutex:
+            return self._heap.is_empty()
+
+    def full(self) -> bool:
+        """
+        Returns True if the queue is bounded and full. The value may be stale as soon as it is returned.
+        """
+        with self._mutex:
+            return 0 < self._maxsize <= self._heap.size()
+
+    @staticmethod
+    def _wait(condition: threading.Condition, ready, block: bool, timeout: float, exception) -> None:
+        """
+        Waits on the condition, with its lock held, until ready() returns True.
+        Raises the specified exception if it does not happen without blocking or within the timeout.
+        """
+        if not block:
+            if not ready():
+                raise exception
+        elif timeout is None:
+            while not ready():
+                condition.wait()
+        elif timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        else:
+            deadline = time.monotonic() + timeout
+            while not ready():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0.0:
+                    raise exception
+                condition.wait(remaining)
+
+
+class AsyncMinHeapQueue:
+    """
+    asyncio priority queue that always hands out its smallest item first.
+
+    It is meant to be used from coroutines of a single event loop, and is not thread-safe.
+    Coroutines waiting in get() or put() each wait on their own future, which is resolved
+    as soon as an item or free space becomes available, so there is no polling.
+    """
+
+    def __init__(self, maxsize: int = 0, arity: int = 2, key=None):
+        """
+        Initialize a new AsyncMinHeapQueue
+
+        maxsize: maximum number of queued items, or 0 (or less) for an unbounded queue
+        arity, key: passed on to the underlying MinHeap
+        """
+        self._maxsize = maxsize
+        self._heap = MinHeap(arity=arity, key=key)
+
+        # Futures of the coroutines waiting for an item and for free space, oldest first
+        self._getters = collections.deque()
+        self._putters = collections.deque()
+
+        self._unfinished_tasks = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def __aiter__(self):
+        """
+        Drains the queue with async for, yielding its items in priority order until it is empty.
+        Items added while draining are picked up in their priority order.
+        """
+        return self._drain()
+
+    async def put(self, item: object) -> None:
+        """
+        Adds an item to the queue, waiting for free space if the queue is full.
+        """
+        while self.full():
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                self._abandon(putter, self._putters, lambda: not self.full())
+                raise
+
+        self.put_nowait(item)
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Adds an item to the queue without waiting. Raises asyncio.QueueFull if the queue is full.
+        """
+        if self.full():
+            raise asyncio.QueueFull
+
+        self._heap.add(item)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+
+    async def get(self) -> object:
+        """
+        Removes and returns the smallest item of the queue, waiting for an item if the queue is empty.
+        """
+        while self.empty():
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                self._abandon(getter, self._getters, lambda: not self.empty())
+                raise
+
+        return self.get_nowait()
+
+    def get_nowait(self) -> object:
+        """
+        Removes and returns the smallest item without waiting. Raises asyncio.QueueEmpty if the queue is empty.
+        """
+        if self.empty():
+            raise asyncio.QueueEmpty
+
+        item = self._heap.remove_min()
+        self._wakeup_next(self._putters)
+        return item
+
+    def task_done(self) -> None:
+        """
+        Marks one previously retrieved item as fully processed.
+        Raises ValueError if called more times than there were items put in the queue.
+        """
+        if self._unfinished_tasks <= 0:
+            raise ValueError('task_done() called too many times')
+
+        self._unfinished_tasks -= 1
+        if self._unfinished_tasks == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """
+        Waits until every item put in the queue has been retrieved and marked with task_done().
+        """
+        if self._unfinished_tasks > 0:
+            await self._finished.wait()
+
+    def qsize(self) -> int:
+        """
+        Returns the number of queued items.
+        """
+        return self._heap.size()
+
+    def empty(self) -> bool:
+        """
+        Returns True if the queue is empty.
+        """
+        return self._heap.is_empty()
+
+    def full(self) -> bool:
+        """
+        Returns True if the queue is bounded and full.
+        """
+        return 0 < self._maxsize <= self._heap.size()
+
+    async def _drain(self):
+        """
+        Yields the queue's items in priority order until it is empty.
+        """
+        while not self.empty():
+            yield self.get_nowait()
+
+    @staticmethod
+    def _wakeup_next(waiters: collections.deque) -> None:
+        """
+        Wakes up the oldest waiter that is still waiting, if any.
+        """
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    def _abandon(self, waiter: asyncio.Future, waiters: collections.deque, ready) -> None:
+        """
+        Cleans up after a waiter that was cancelled or interrupted.
+        If it had already been woken up, the wakeup is passed on to the next waiter so it is not lost.
+        """
+        waiter.cancel()
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            pass
+        if ready() and not waiter.cancelled():
+            self._wakeup_next(waiters)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nMinHeapQueue example 1")
+    print("----------------------")
+    q = MinHeapQueue(maxsize=10)
+
+    def consumer():
+        while True:
+            item = q.get()
+            print("Got", item)
+            q.task_done()
+
+    for value in [50, 10, 40, 20, 30]:
+        q.put(value)
+    threading.Thread(target=consumer, daemon=True).start()
+    q.join()
+
+    print("\nMinHeapQueue example 2")
+    print("----------------------")
+    q = MinHeapQueue()
+    for value in [50, 10, 40, 20, 30]:
+        q.put(value)
+    print(q.get_many(3), q.qsize())
+    try:
+        q.get(timeout=0.01)
+        q.get(timeout=0.01)
+        q.get(timeout=0.01)
+    except Empty:
+        print("Empty raised")
+
+    print("\nAsyncMinHeapQueue example 1")
+    print("---------------------------")
+
+    async def async_example():
+        q = AsyncMinHeapQueue(maxsize=3)
+
+        async def producer():
+            for value in [50, 10, 40, 20, 30]:
+                await q.put(value)
+
+        async def consumer():
+            for _ in range(5):
+                print("Got", await q.get())
+
+        await asyncio.gather(producer(), consumer())
+
+        for value in [3, 1, 2]:
+            q.put_nowait(value)
+        print([item async for item in q])
+
+    asyncio.run(async_example())
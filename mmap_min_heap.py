@@ -0,0 +1,372 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines a MmapMinHeap class, a persistent numeric min heap stored in a memory-mapped file.
+#               The heap survives restarts and crashes of the process, and only the pages being touched
+#               need to be resident in memory.
+
+import mmap
+import os
+import struct
+
+from min_heap import MinHeapException
+from numeric_min_heap import NumericMinHeap
+
+
+# File header: magic and version, priority typecode, the heap's size and capacity, then the journal of the
+# operation in progress: its state, the index of the hole being sifted, the size the operation commits,
+# and the record being sifted, as its payload offset and its priority
+_HEADER = struct.Struct('<8sc7xqqqqqq8x')
+_MAGIC = b'MINHEAP2'
+_SIZE_OFFSET = 16
+_PRIORITY_OFFSET = 64
+_ITEM_SIZE = 8
+
+# Indices of the 64-bit int header fields, from _SIZE_OFFSET onwards
+_SIZE = 0
+_CAPACITY = 1
+_STATE = 2
+_HOLE = 3
+_NEW_SIZE = 4
+_PENDING_OFFSET = 5
+
+# States of the journal: no operation in progress, a record being sifted, or the whole heap being rebuilt
+_CLEAN = 0
+_SIFTING = 1
+_REBUILDING = 2
+
+
+class MmapMinHeap(NumericMinHeap):
+    """
+    NumericMinHeap of (priority, payload offset) records stored in a memory-mapped file.
+
+    Every record is 16 bytes: an 8-byte priority ('d' or 'q') and an 8-byte payload offset, typically
+    the position of the payload in a separate log file. The file holds a header followed by a column of
+    priorities and a column of offsets, each `capacity` records long, so the sift loops of NumericMinHeap
+    work on both columns directly. Like DynamicArray.resize(), the capacity doubles when the heap is full.
+
+    Reopening the file restores the heap exactly as it was, without rebuilding it. Call flush() to force
+    the changes to disk, and close() when done.
+
+    Every add() and remove_min() is applied in full or not at all if the process dies part of the way through.
+    Before it touches the heap, an operation journals the record it is about to sift and the size it will
+    commit, then marks the journal as sifting. The sift loops keep the journaled hole index up to date, so the
+    array always holds every record but the pending one, plus a stale copy at the hole. Reopening the file
+    after such a crash writes the pending record into the hole, commits the size and rebuilds the heap.
+    A build_heap() interrupted by a crash leaves either the new heap or an empty one.
+    A crash of the operating system or a power loss can still lose pages that were not flushed.
+    """
+
+    def __init__(self, path: str, typecode: str = 'd', capacity: int = 4):
+        """
+        Open the heap stored at the specified path, creating the file if it does not exist.
+
+        typecode: 'd' to store priorities as floats, 'q' to store them as 64-bit ints
+        capacity: initial capacity of a new file
+        An existing file keeps the typecode and capacity it was created with.
+        """
+        if typecode not in ('d', 'q'):
+            raise MinHeapException("Typecode must be 'd' (float) or 'q' (64-bit int)")
+        if capacity < 1:
+            raise MinHeapException('Capacity must be a positive integer')
+
+        self._path = path
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+
+        if os.fstat(self._file.fileno()).st_size == 0:
+            # New file: write the header and allocate the initial capacity
+            self._file.write(_HEADER.pack(_MAGIC, typecode.encode(), 0, capacity, 0, 0, 0, 0))
+            self._file.truncate(self._file_size(capacity))
+        else:
+            header = self._file.read(_HEADER.size)
+            if len(header) != _HEADER.size or header[:len(_MAGIC)] != _MAGIC:
+                self._file.close()
+                raise MinHeapException('Not a MmapMinHeap file')
+            _, stored_typecode, _, capacity, _, _, _, _ = _HEADER.unpack(header)
+            typecode = stored_typecode.decode()
+
+        self._typecode = typecode
+        self._map(capacity)
+
+        # The process died while an operation was in progress
+        if self._header[_STATE] != _CLEAN:
+            self._recover()
+
+    def __enter__(self) -> "MmapMinHeap":
+        """
+        Returns the heap itself, so it can be used in a with statement that closes it.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Closes the heap at the end of a with statement.
+        """
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Return MmapMinHeap content in human-readable form
+        """
+        size = self.size()
+        return "HEAP " + str(list(zip(self._heap[:size].tolist(), self._ids[:size].tolist())))
+
+    def add(self, priority, offset: int) -> None:
+        """
+        Adds a new (priority, payload offset) record to the heap in the appropriate place.
+        """
+        # If the file is already full, we double its capacity
+        size = self.size()
+        if size == self._capacity:
+            self._resize(self._capacity * 2)
+
+        # The record is first written past the end of the heap, where a crash cannot expose it
+        self._heap[size] = priority
+        self._ids[size] = offset
+
+        self._begin(priority, offset, size, size + 1)
+        self._header[_SIZE] = size + 1
+        self._percolate_up(size)
+        self._header[_STATE] = _CLEAN
+
+    def remove_min(self) -> tuple:
+        """
+        Removes and returns the (priority, payload offset) record with the minimum priority.
+        """
+        min_value = self.get_min()
+
+        # Move the last record to the root and sift it down over the shortened heap
+        last_index = self.size() - 1
+        if last_index == 0:
+            self._header[_SIZE] = 0
+            return min_value
+
+        self._begin(self._heap[last_index], self._ids[last_index], 0, last_index)
+        self._header[_SIZE] = last_index
+        self._heap[0] = self._heap[last_index]
+        self._ids[0] = self._ids[last_index]
+        self._percolate_down(0)
+        self._header[_STATE] = _CLEAN
+
+        return min_value
+
+    def build_heap(self, priorities, ids=None) -> None:
+        """
+        Replaces the heap with a new heap, built from the specified priorities and payload offsets in O(n) time.
+        """
+        priorities = list(priorities)
+        if ids is None:
+            raise MinHeapException('Payload offsets are required')
+        ids = list(ids)
+        if len(ids) != len(priorities):
+            raise MinHeapException('Priorities and payload offsets must have the same length')
+
+        # Grow the file to the next power-of-two multiple of the capacity that fits every record.
+        # The heap is emptied first, so a crash before the new records are all written leaves it empty,
+        # and it is marked as being rebuilt before they are committed, so a crash after that rebuilds it
+        new_capacity = self._capacity
+        while new_capacity < len(priorities):
+            new_capacity *= 2
+        self._header[_SIZE] = 0
+        if new_capacity != self._capacity:
+            self._resize(new_capacity)
+
+        for index in range(len(priorities)):
+            self._heap[index] = priorities[index]
+            self._ids[index] = ids[index]
+        self._header[_STATE] = _REBUILDING
+        self._header[_SIZE] = len(priorities)
+        self._heapify()
+
+    def size(self) -> int:
+        """
+        Returns the size of the heap.
+        """
+        return self._header[_SIZE]
+
+    def clear(self) -> None:
+        """
+        Clears the heap. The file keeps its capacity.
+        """
+        self._header[_SIZE] = 0
+
+    def flush(self) -> None:
+        """
+        Writes any changes still held in memory to the file.
+        """
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """
+        Flushes the heap and closes its file. The heap cannot be used afterwards.
+        """
+        self.flush()
+        self._unmap()
+        self._file.close()
+
+    @staticmethod
+    def _file_size(capacity: int) -> int:
+        """
+        Returns the file size needed to hold a header and the specified number of records.
+        """
+        return _HEADER.size + 2 * _ITEM_SIZE * capacity
+
+    def _map(self, capacity: int) -> None:
+        """
+        Memory-maps the file and sets up typed views of the header fields and both record columns.
+        """
+        self._capacity = capacity
+        self._mmap = mmap.mmap(self._file.fileno(), self._file_size(capacity))
+
+        buffer = memoryview(self._mmap)
+        ids_offset = _HEADER.size + _ITEM_SIZE * capacity
+        self._header = buffer[_SIZE_OFFSET:_PRIORITY_OFFSET].cast('q')
+        self._pending = buffer[_PRIORITY_OFFSET:_HEADER.size].cast(self._typecode)
+        self._heap = buffer[_HEADER.size:ids_offset].cast(self._typecode)
+        self._ids = buffer[ids_offset:ids_offset + _ITEM_SIZE * capacity].cast('q')
+        buffer.release()
+
+    def _unmap(self) -> None:
+        """
+        Releases the typed views and closes the memory map.
+        """
+        self._header.release()
+        self._pending.release()
+        self._heap.release()
+        self._ids.release()
+        self._mmap.close()
+
+    def _begin(self, priority, offset: int, hole_index: int, new_size: int) -> None:
+        """
+        Journals the record about to be sifted from the specified hole and the size the operation commits,
+        then marks the journal as sifting. Until its state changes, a restart completes the operation.
+        """
+        self._pending[0] = priority
+        self._header[_PENDING_OFFSET] = offset
+        self._header[_HOLE] = hole_index
+        self._header[_NEW_SIZE] = new_size
+        self._header[_STATE] = _SIFTING
+
+    def _recover(self) -> None:
+        """
+        Completes the operation that was in progress when the process died. An interrupted sift has its
+        pending record written into the hole and its size committed, then the heap is rebuilt from scratch,
+        since the sift or rebuild stopped part of the way.
+        """
+        if self._header[_STATE] == _SIFTING:
+            hole_index = self._header[_HOLE]
+            self._heap[hole_index] = self._pending[0]
+            self._ids[hole_index] = self._header[_PENDING_OFFSET]
+            self._header[_SIZE] = self._header[_NEW_SIZE]
+        self._heapify()
+
+    def _heapify(self) -> None:
+        """
+        Restores the heap property over the whole heap, bottom-up, journaling every sift.
+        The heap stays marked as being rebuilt until the last sift is done.
+        """
+        self._header[_STATE] = _REBUILDING
+
+        # We sift down every non-leaf node, going up until we get to the root
+        for node_index in range((self.size() // 2) - 1, -1, -1):
+            self._begin(self._heap[node_index], self._ids[node_index], node_index, self.size())
+            self._percolate_down(node_index)
+            self._header[_STATE] = _REBUILDING
+
+        self._header[_STATE] = _CLEAN
+
+    def _percolate_up(self, node_index: int) -> None:
+        """
+        Percolates a record up the heap, starting from the specified index.
+        Parents are shifted down into the hole, whose index is journaled after every move,
+        and the record is written once at its final index.
+        """
+        heap = self._heap
+        ids = self._ids
+        header = self._header
+        priority = heap[node_index]
+        item_id = ids[node_index]
+
+        while node_index > 0:
+            parent_index = (node_index - 1) >> 1
+            parent = heap[parent_index]
+            if not priority < parent:
+                break
+            heap[node_index] = parent
+            ids[node_index] = ids[parent_index]
+            node_index = parent_index
+            header[_HOLE] = node_index
+
+        heap[node_index] = priority
+        ids[node_index] = item_id
+
+    def _percolate_down(self, parent_index: int) -> None:
+        """
+        Percolates a record down the heap, starting from the specified index.
+        Smaller children are shifted up into the hole, whose index is journaled after every move,
+        and the record is written once at its final index.
+        """
+        heap = self._heap
+        ids = self._ids
+        header = self._header
+        size = self.size()
+        priority = heap[parent_index]
+        item_id = ids[parent_index]
+
+        child_index = (2 * parent_index) + 1
+        while child_index < size:
+            # We pick the smaller child, preferring the left one on ties
+            child = heap[child_index]
+            right_child_index = child_index + 1
+            if right_child_index < size and heap[right_child_index] < child:
+                child_index = right_child_index
+                child = heap[child_index]
+
+            if not child < priority:
+                break
+            heap[parent_index] = child
+            ids[parent_index] = ids[child_index]
+            parent_index = child_index
+            header[_HOLE] = parent_index
+            child_index = (2 * parent_index) + 1
+
+        heap[parent_index] = priority
+        ids[parent_index] = item_id
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Grows the file to the specified capacity, moving the column of payload offsets to its new place.
+        """
+        size = self.size()
+        old_ids_offset = _HEADER.size + _ITEM_SIZE * self._capacity
+        new_ids_offset = _HEADER.size + _ITEM_SIZE * new_capacity
+
+        self._unmap()
+        self._file.truncate(self._file_size(new_capacity))
+        self._map(new_capacity)
+
+        # The new column starts past the end of the old one's records, so they stay intact until
+        # the new capacity is written, and a crash during the move leaves the old layout readable
+        self._mmap.move(new_ids_offset, old_ids_offset, _ITEM_SIZE * size)
+        self._header[_CAPACITY] = new_capacity
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    print("\nMmapMinHeap example 1")
+    print("---------------------")
+    path = os.path.join(tempfile.mkdtemp(), 'queue.heap')
+    with MmapMinHeap(path) as h:
+        for offset, priority in enumerate([50.0, 10.0, 40.0, 20.0, 30.0]):
+            h.add(priority, offset * 100)
+        print(h, h._capacity)
+
+    # Reopen the file, as after a restart
+    with MmapMinHeap(path) as h:
+        print(h.size())
+        while not h.is_empty():
+            print(h.remove_min(), end=' ')
+        print()
+    os.remove(path)
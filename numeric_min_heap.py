@@ -0,0 +1,210 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines a NumericMinHeap class, a min heap of int or float priorities stored in a typed,
+#               contiguous array.array buffer instead of a DynamicArray of Python objects.
+
+from array import array
+
+from min_heap import MinHeapException
+
+
+class NumericMinHeap:
+    """
+    Min heap of numeric priorities, optionally paired with integer payload ids.
+
+    Priorities live unboxed in an array.array ('d' for floats, 'q' for 64-bit ints), which takes
+    8 bytes per entry instead of a pointer plus a boxed number, and the sift loops index the buffer
+    directly. Payload ids, if enabled, are kept in a parallel 'q' array.
+    """
+
+    def __init__(self, start_heap=None, typecode: str = 'd', with_ids: bool = False):
+        """
+        Initialize a new NumericMinHeap
+
+        start_heap: optional priorities, or (priority, id) pairs if with_ids is True
+        typecode: 'd' to store priorities as floats, 'q' to store them as 64-bit ints
+        with_ids: if True, every priority is stored with an integer payload id
+        """
+        if typecode not in ('d', 'q'):
+            raise MinHeapException("Typecode must be 'd' (float) or 'q' (64-bit int)")
+
+        self._typecode = typecode
+        self._heap = array(typecode)
+        self._ids = array('q') if with_ids else None
+
+        if start_heap:
+            if with_ids:
+                pairs = list(start_heap)
+                self.build_heap([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+            else:
+                self.build_heap(start_heap)
+
+    def __str__(self) -> str:
+        """
+        Return NumericMinHeap content in human-readable form
+        """
+        if self._ids is None:
+            return "HEAP " + str(self._heap.tolist())
+        return "HEAP " + str(list(zip(self._heap.tolist(), self._ids.tolist())))
+
+    def add(self, priority, item_id: int = None) -> None:
+        """
+        Adds new priority (and its payload id, if ids are enabled) to the heap in the appropriate place.
+        """
+        if self._ids is not None and item_id is None:
+            raise MinHeapException('This heap stores payload ids, so item_id is required')
+
+        # The priority is stored first, and taken back off if the id cannot be stored,
+        # so that a failed add() never leaves the two buffers out of step
+        self._heap.append(priority)
+        if self._ids is not None:
+            try:
+                self._ids.append(item_id)
+            except (TypeError, OverflowError):
+                self._heap.pop()
+                raise
+
+        self._percolate_up(len(self._heap) - 1)
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the heap is empty. Returns False otherwise.
+        """
+        return self.size() == 0
+
+    def get_min(self):
+        """
+        Returns the minimum priority of the heap, or a (priority, id) tuple if ids are enabled.
+        """
+        if self.is_empty():
+            raise MinHeapException
+        if self._ids is None:
+            return self._heap[0]
+        return self._heap[0], self._ids[0]
+
+    def remove_min(self):
+        """
+        Removes and returns the minimum priority of the heap, or a (priority, id) tuple if ids are enabled.
+        """
+        min_value = self.get_min()
+
+        # Take the last entry off the end of the buffer and, if entries remain, sift it down from the root
+        last_priority = self._heap.pop()
+        last_id = self._ids.pop() if self._ids is not None else None
+        if len(self._heap) > 0:
+            self._heap[0] = last_priority
+            if self._ids is not None:
+                self._ids[0] = last_id
+            self._percolate_down(0)
+
+        return min_value
+
+    def build_heap(self, priorities, ids=None) -> None:
+        """
+        Replaces the heap with a new heap, built from the specified priorities (and ids) in O(n) time.
+        """
+        # The new buffers are converted and checked before either of them replaces the current one
+        heap = array(self._typecode, priorities)
+        if self._ids is not None:
+            if ids is None:
+                raise MinHeapException('This heap stores payload ids, so ids are required')
+            ids = array('q', ids)
+            if len(ids) != len(heap):
+                raise MinHeapException('Priorities and ids must have the same length')
+            self._ids = ids
+        self._heap = heap
+
+        # We sift down every non-leaf node, going up until we get to the root
+        for node_index in range((len(self._heap) // 2) - 1, -1, -1):
+            self._percolate_down(node_index)
+
+    def size(self) -> int:
+        """
+        Returns the size of the heap.
+        """
+        return len(self._heap)
+
+    def clear(self) -> None:
+        """
+        Clears the heap.
+        """
+        self._heap = array(self._typecode)
+        if self._ids is not None:
+            self._ids = array('q')
+
+    def _percolate_up(self, node_index: int) -> None:
+        """
+        Percolates an entry up the heap, starting from the specified index.
+        Parents are shifted down into the hole, and the entry is written once at its final index.
+        """
+        heap = self._heap
+        ids = self._ids
+        priority = heap[node_index]
+        item_id = ids[node_index] if ids is not None else None
+
+        while node_index > 0:
+            parent_index = (node_index - 1) >> 1
+            parent = heap[parent_index]
+            if not priority < parent:
+                break
+            heap[node_index] = parent
+            if ids is not None:
+                ids[node_index] = ids[parent_index]
+            node_index = parent_index
+
+        heap[node_index] = priority
+        if ids is not None:
+            ids[node_index] = item_id
+
+    def _percolate_down(self, parent_index: int) -> None:
+        """
+        Percolates an entry down the heap, starting from the specified index.
+        Smaller children are shifted up into the hole, and the entry is written once at its final index.
+        """
+        heap = self._heap
+        ids = self._ids
+        size = self.size()
+        priority = heap[parent_index]
+        item_id = ids[parent_index] if ids is not None else None
+
+        child_index = (2 * parent_index) + 1
+        while child_index < size:
+            # We pick the smaller child, preferring the left one on ties
+            child = heap[child_index]
+            right_child_index = child_index + 1
+            if right_child_index < size and heap[right_child_index] < child:
+                child_index = right_child_index
+                child = heap[child_index]
+
+            if not child < priority:
+                break
+            heap[parent_index] = child
+            if ids is not None:
+                ids[parent_index] = ids[child_index]
+            parent_index = child_index
+            child_index = (2 * parent_index) + 1
+
+        heap[parent_index] = priority
+        if ids is not None:
+            ids[parent_index] = item_id
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nNumericMinHeap example 1")
+    print("------------------------")
+    h = NumericMinHeap([300.5, 20, 6, 200, 90.25, 150, 1])
+    print(h)
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+
+    print("\nNumericMinHeap example 2")
+    print("------------------------")
+    h = NumericMinHeap(typecode='q', with_ids=True)
+    for item_id, priority in enumerate([40, 10, 30, 20]):
+        h.add(priority, item_id)
+    print(h)
+    print(h.remove_min(), h.remove_min())
@@ -0,0 +1,191 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines a PairingMinHeap class, a pointer-based min heap with the same interface as MinHeap
+#               that can meld a whole other heap into itself in O(1) time.
+
+from min_heap import MinHeapException
+
+
+class _PairingNode:
+    """
+    Node of a pairing heap, stored as a multiway tree in leftmost-child, right-sibling form.
+    """
+    __slots__ = ('item', 'priority', 'child', 'sibling')
+
+    def __init__(self, item: object, priority: object):
+        """
+        Initialize a new node with no children and no siblings
+        """
+        self.item = item
+        self.priority = priority
+        self.child = None
+        self.sibling = None
+
+
+class PairingMinHeap:
+    """
+    Min heap stored as a pairing heap: a tree of nodes where every node is no greater than its children.
+
+    add() and meld() link a single tree under the root in O(1) time. remove_min() relinks the root's children
+    in two passes (pairs left to right, then the pairs right to left), which costs O(log n) amortized.
+    Every node takes four slots, and the array-backed MinHeap remains faster when heaps are never melded.
+    """
+
+    def __init__(self, start_heap=None, key=None):
+        """
+        Initialize a new PairingMinHeap
+
+        key: optional function computing the priority of an item. It is called once per item,
+             and items are then compared by their cached priorities only, never by themselves
+        """
+        self._key = key
+        self._root = None
+        self._size = 0
+
+        if start_heap:
+            for node in start_heap:
+                self.add(node)
+
+    def __str__(self) -> str:
+        """
+        Return PairingMinHeap content in human-readable form, in tree pre-order
+        """
+        heap_data = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            heap_data.append(node.item)
+            if node.sibling is not None:
+                stack.append(node.sibling)
+            if node.child is not None:
+                stack.append(node.child)
+        return "HEAP " + str(heap_data)
+
+    def add(self, node: object) -> None:
+        """
+        Adds new item to the heap in O(1) time.
+        """
+        priority = self._key(node) if self._key is not None else node
+        new_node = _PairingNode(node, priority)
+
+        if self._root is None:
+            self._root = new_node
+        else:
+            self._root = self._link(self._root, new_node)
+        self._size += 1
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the heap is empty. Returns False otherwise.
+        """
+        return self._root is None
+
+    def get_min(self) -> object:
+        """
+        Returns the minimum value of the heap.
+        """
+        if self._root is None:
+            raise MinHeapException
+        return self._root.item
+
+    def remove_min(self) -> object:
+        """
+        Removes and returns the minimum value of the heap.
+        """
+        if self._root is None:
+            raise MinHeapException
+
+        root = self._root
+        self._root = self._merge_pairs(root.child)
+        self._size -= 1
+        return root.item
+
+    def meld(self, other: "PairingMinHeap") -> None:
+        """
+        Moves every item of the other heap into this one in O(1) time, leaving the other heap empty.
+        Both heaps must use the same key function.
+        """
+        if other is self:
+            raise MinHeapException('A heap cannot be melded with itself')
+        if other._key is not self._key:
+            raise MinHeapException('Only heaps with the same key function can be melded')
+
+        if other._root is not None:
+            self._root = other._root if self._root is None else self._link(self._root, other._root)
+            self._size += other._size
+            other.clear()
+
+    def size(self) -> int:
+        """
+        Returns the size of the heap.
+        """
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Clears the heap.
+        """
+        self._root = None
+        self._size = 0
+
+    @staticmethod
+    def _link(first: _PairingNode, second: _PairingNode) -> _PairingNode:
+        """
+        Links two trees by making the root with the greater priority the leftmost child of the other one.
+        Returns the root of the linked tree, preferring the first root on ties.
+        """
+        if second.priority < first.priority:
+            first, second = second, first
+        second.sibling = first.child
+        first.child = second
+        return first
+
+    def _merge_pairs(self, first: _PairingNode) -> _PairingNode:
+        """
+        Links a list of sibling trees into a single tree and returns its root, or None if the list is empty.
+        """
+        # First pass: we link the trees in pairs, from left to right
+        pairs = []
+        node = first
+        while node is not None:
+            second = node.sibling
+            if second is None:
+                pairs.append(node)
+                break
+            following = second.sibling
+            node.sibling = second.sibling = None
+            pairs.append(self._link(node, second))
+            node = following
+
+        if not pairs:
+            return None
+
+        # Second pass: we link each pair into the accumulated tree, from right to left
+        root = pairs.pop()
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        root.sibling = None
+        return root
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nPairingMinHeap example 1")
+    print("------------------------")
+    h = PairingMinHeap([300, 20, 6, 200, 90, 150, 1])
+    print(h)
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+
+    print("\nPairingMinHeap meld example 1")
+    print("-----------------------------")
+    h1 = PairingMinHeap([50, 10, 40])
+    h2 = PairingMinHeap([30, 20, 5])
+    h1.meld(h2)
+    print(h1.size(), h2.size(), h1.get_min())
+    while not h1.is_empty():
+        print(h1.remove_min(), end=' ')
+    print()
@@ -0,0 +1,125 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines parallel_heapsort(), which heapsorts chunks of an array in a pool of worker processes
+#               and combines the sorted chunks with merge_sorted(), a MinHeap-based k-way merge.
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from dynamic_array import DynamicArray, array_typecode
+from min_heap import MinHeapException, heapsort, merge_sorted
+
+
+# Arrays shorter than this are sorted serially. With forked workers, starting the pool, copying the values
+# and merging the chunks back cost about as much as serially heapsorting ~4,000 values, with 2 or 8 workers.
+# We keep a margin, since spawned workers (the default outside Linux) are slower to start
+PARALLEL_THRESHOLD = 10000
+
+
+def parallel_heapsort(da: DynamicArray, workers: int = None, arity: int = 2,
+                      threshold: int = PARALLEL_THRESHOLD) -> None:
+    """
+    Sorts an array in the same order as heapsort(), heapsorting one chunk per worker process in parallel.
+
+    workers: number of worker processes, os.cpu_count() if None
+    arity: number of children per node of the heaps used for sorting
+    threshold: arrays shorter than this, like runs with a single worker, are sorted serially
+
+    An array of only ints (that fit in 64 bits) or only floats is handed to the workers through a shared
+    memory block, which they sort in place. Any other array is pickled to the workers chunk by chunk.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise MinHeapException('Number of workers must be a positive integer')
+
+    size = da.length()
+    if workers == 1 or size < threshold:
+        heapsort(da, arity=arity, engine='heap')
+        return
+
+    values = da.to_list()
+    bounds = [size * worker // workers for worker in range(workers + 1)]
+    typecode = array_typecode(values)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if typecode is None:
+            chunks = list(pool.map(_sort_chunk, [values[bounds[i]:bounds[i + 1]] for i in range(workers)],
+                                   [arity] * workers))
+        else:
+            chunks = _sort_shared(pool, values, typecode, bounds, arity)
+
+    # Every chunk is in descending order, so we merge them in ascending order from their ends
+    # and fill the array from its end
+    index = size
+    for value in merge_sorted(*[reversed(chunk) for chunk in chunks]):
+        index -= 1
+        values[index] = value
+    da.overwrite(values)
+
+
+def _sort_shared(pool: ProcessPoolExecutor, values: list, typecode: str, bounds: list, arity: int) -> list:
+    """
+    Copies the values into a shared memory block, has the workers heapsort their chunks of it in place,
+    and returns the sorted chunks as lists.
+    """
+    block = array(typecode, values)
+    memory = shared_memory.SharedMemory(create=True, size=max(len(block) * block.itemsize, 1))
+    view = memory.buf.cast(typecode)
+    try:
+        view[:len(block)] = block
+
+        chunks = range(len(bounds) - 1)
+        list(pool.map(_sort_shared_chunk, [memory.name] * len(chunks), [typecode] * len(chunks),
+                      bounds[:-1], bounds[1:], [arity] * len(chunks)))
+
+        return [view[bounds[i]:bounds[i + 1]].tolist() for i in chunks]
+    finally:
+        view.release()
+        memory.close()
+        memory.unlink()
+
+
+def _sort_chunk(values: list, arity: int) -> list:
+    """
+    Worker: heapsorts a pickled chunk and returns it.
+    """
+    chunk = DynamicArray.adopt(values)
+    heapsort(chunk, arity=arity, engine='heap')
+    return chunk.to_list()
+
+
+def _sort_shared_chunk(name: str, typecode: str, start: int, end: int, arity: int) -> None:
+    """
+    Worker: heapsorts the values between the start and end indices of the shared memory block in place.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    view = memory.buf.cast(typecode)
+    try:
+        chunk = DynamicArray.adopt(view[start:end].tolist())
+        heapsort(chunk, arity=arity, engine='heap')
+        view[start:end] = array(typecode, chunk.to_list())
+    finally:
+        view.release()
+        memory.close()
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+    import random
+
+    print("\nparallel_heapsort example 1")
+    print("---------------------------")
+    da = DynamicArray([100, 20, 6, 200, 90, 150, 300])
+    parallel_heapsort(da, workers=2, threshold=0)
+    print(da)
+
+    print("\nparallel_heapsort example 2")
+    print("---------------------------")
+    values = [random.random() for _ in range(20000)]
+    da = DynamicArray.adopt(list(values))
+    parallel_heapsort(da, workers=4, threshold=0)
+    print(da.to_list() == sorted(values, reverse=True))
@@ -0,0 +1,206 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines a RadixMinHeap class, a min heap for non-negative integer priorities that never go below
+#               the last minimum removed, as with event timestamps or Dijkstra distances.
+
+from dynamic_array import DynamicArray
+from min_heap import MinHeapException
+
+
+class RadixMinHeap:
+    """
+    Radix heap with the same interface as MinHeap, for monotone integer priorities.
+
+    Every entry sits in the bucket numbered by the bit length of (priority XOR last minimum removed),
+    so bucket 0 holds the entries equal to the last minimum, and bucket i the entries that first differ
+    from it at bit i - 1. When bucket 0 runs out, the first non-empty bucket is scanned for its minimum,
+    which becomes the new last minimum, and its entries move to lower buckets. An entry can only move
+    down, so add() is O(1) and remove_min() is O(log C) amortized, where C is the largest priority,
+    without a single comparison between entries of different buckets.
+
+    Adding an item whose priority is smaller than the last minimum removed raises MinHeapException.
+    """
+
+    def __init__(self, start_heap=None, key=None):
+        """
+        Initialize a new RadixMinHeap
+
+        key: optional function computing the non-negative integer priority of an item.
+             It is called once per item. Without it, the items themselves must be such integers
+        """
+        self._key = key
+        self._last = 0
+        self._size = 0
+
+        # Parallel lists of priorities and items, one pair per bucket
+        self._priorities = [[]]
+        self._items = [[]]
+
+        if start_heap:
+            for node in start_heap:
+                self.add(node)
+
+    def __str__(self) -> str:
+        """
+        Return RadixMinHeap content in human-readable form, bucket by bucket
+        """
+        heap_data = [item for bucket in self._items for item in bucket]
+        return "HEAP " + str(heap_data)
+
+    def add(self, node: object) -> None:
+        """
+        Adds new item to its bucket in O(1) time.
+        """
+        priority = self._key(node) if self._key is not None else node
+        if not isinstance(priority, int):
+            raise MinHeapException('Priorities must be integers')
+        if priority < self._last:
+            raise MinHeapException(f'Priority {priority} is smaller than the last minimum removed, {self._last}')
+
+        bucket = (priority ^ self._last).bit_length()
+        while bucket >= len(self._priorities):
+            self._priorities.append([])
+            self._items.append([])
+
+        self._priorities[bucket].append(priority)
+        self._items[bucket].append(node)
+        self._size += 1
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the heap is empty. Returns False otherwise.
+        """
+        return self._size == 0
+
+    def get_min(self) -> object:
+        """
+        Returns the minimum value of the heap.
+        """
+        if self._size == 0:
+            raise MinHeapException
+        self._refill()
+        return self._items[0][-1]
+
+    def remove_min(self) -> object:
+        """
+        Removes and returns the minimum value of the heap.
+        """
+        if self._size == 0:
+            raise MinHeapException
+        self._refill()
+
+        self._priorities[0].pop()
+        self._size -= 1
+        return self._items[0].pop()
+
+    def build_heap(self, da, copy: bool = True) -> None:
+        """
+        Replaces the heap with a new heap, holding the values within the specified array, in O(n) time.
+        Every priority is checked before the heap is changed, so a rejected array leaves the heap as it was.
+        Priorities must still be no smaller than the last minimum removed.
+
+        da: a DynamicArray, built-in list or any other iterable
+        copy: accepted for compatibility with MinHeap.build_heap(). The values are always copied into the buckets
+        """
+        nodes = da.to_list() if isinstance(da, DynamicArray) else list(da)
+        priorities = nodes if self._key is None else [self._key(node) for node in nodes]
+        for priority in priorities:
+            if not isinstance(priority, int):
+                raise MinHeapException('Priorities must be integers')
+            if priority < self._last:
+                raise MinHeapException(f'Priority {priority} is smaller than the last minimum removed, '
+                                       f'{self._last}')
+
+        # We compute every bucket first, so the bucket lists are only grown once
+        buckets = [(priority ^ self._last).bit_length() for priority in priorities]
+        bucket_count = max(buckets, default=0) + 1
+        self._priorities = [[] for _ in range(bucket_count)]
+        self._items = [[] for _ in range(bucket_count)]
+        for index in range(len(nodes)):
+            self._priorities[buckets[index]].append(priorities[index])
+            self._items[buckets[index]].append(nodes[index])
+        self._size = len(nodes)
+
+    def last_min(self) -> int:
+        """
+        Returns the priority of the last minimum removed, below which items cannot be added.
+        """
+        return self._last
+
+    def size(self) -> int:
+        """
+        Returns the size of the heap.
+        """
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Clears the heap. Priorities must still be no smaller than the last minimum removed.
+        """
+        self._priorities = [[]]
+        self._items = [[]]
+        self._size = 0
+
+    def _refill(self) -> None:
+        """
+        If bucket 0 is empty, makes the minimum of the first non-empty bucket the new last minimum,
+        and redistributes that bucket's entries, which fills bucket 0. The heap must not be empty.
+        """
+        if self._priorities[0]:
+            return
+
+        bucket = 1
+        while not self._priorities[bucket]:
+            bucket += 1
+
+        priorities = self._priorities[bucket]
+        items = self._items[bucket]
+        self._priorities[bucket] = []
+        self._items[bucket] = []
+
+        # Every entry of the bucket now differs from the new last minimum below bit bucket - 1,
+        # so it lands in a lower bucket
+        last = self._last = min(priorities)
+        for index in range(len(priorities)):
+            priority = priorities[index]
+            new_bucket = (priority ^ last).bit_length()
+            self._priorities[new_bucket].append(priority)
+            self._items[new_bucket].append(items[index])
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nRadixMinHeap example 1")
+    print("----------------------")
+    h = RadixMinHeap([300, 20, 6, 200, 90, 150, 1])
+    print(h)
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+
+    print("\nRadixMinHeap example 2")
+    print("----------------------")
+    h = RadixMinHeap(key=lambda event: event[0])
+    h.add((10, 'start'))
+    h.add((25, 'timeout'))
+    print(h.remove_min(), h.last_min())
+    h.add((12, 'retry'))
+    try:
+        h.add((5, 'late'))
+    except MinHeapException as exception:
+        print(exception)
+    print(h.remove_min(), h.remove_min())
+
+    print("\nRadixMinHeap example 3")
+    print("----------------------")
+    h = RadixMinHeap()
+    h.build_heap(DynamicArray([300, 20, 6, 200, 90, 150, 1]))
+    print(h.remove_min(), h.remove_min(), h.size())
+    try:
+        h.build_heap([100, 5, 40])
+    except MinHeapException as exception:
+        print(exception, h.size())
+    h.build_heap([100, 6, 40])
+    print(h.remove_min(), h.size())
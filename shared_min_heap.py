@@ -0,0 +1,222 @@
+# Course:       CS261 - Data Structures
+# Description:  Defines a SharedMinHeap class, a numeric min heap whose storage lives in shared memory
+#               so that several processes can add to and remove from one global queue.
+
+import multiprocessing
+import struct
+from multiprocessing import shared_memory
+
+from min_heap import MinHeapException
+from numeric_min_heap import NumericMinHeap
+
+
+# Layout of the shared memory block: a 64-bit size header, then the priorities, then the payload ids
+_HEADER_SIZE = 8
+_ITEM_SIZE = 8
+
+
+class SharedMinHeap(NumericMinHeap):
+    """
+    NumericMinHeap whose priorities and payload ids are stored in a multiprocessing.shared_memory block
+    of fixed capacity, guarded by a cross-process lock.
+
+    Pass the heap to worker processes as a Process argument or a Pool initializer argument: it pickles
+    down to the block's name and the lock, and reattaches to the same memory on the other side, so
+    items are never pickled themselves. The creating process should call unlink() once all processes
+    are done, and every process should call close().
+    """
+
+    def __init__(self, capacity: int, typecode: str = 'd', with_ids: bool = False, lock=None):
+        """
+        Initialize a new SharedMinHeap, allocating a new shared memory block.
+
+        capacity: maximum number of entries, fixed for the lifetime of the heap
+        typecode: 'd' to store priorities as floats, 'q' to store them as 64-bit ints
+        with_ids: if True, every priority is stored with an integer payload id
+        lock: optional multiprocessing lock to use, a new multiprocessing.Lock() by default
+        """
+        if typecode not in ('d', 'q'):
+            raise MinHeapException("Typecode must be 'd' (float) or 'q' (64-bit int)")
+        if capacity < 1:
+            raise MinHeapException('Capacity must be a positive integer')
+
+        block_size = _HEADER_SIZE + _ITEM_SIZE * capacity * (2 if with_ids else 1)
+        memory = shared_memory.SharedMemory(create=True, size=block_size)
+        struct.pack_into('q', memory.buf, 0, 0)
+
+        self._attach(memory, capacity, typecode, with_ids, lock if lock is not None else multiprocessing.Lock())
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles the heap as a reference to its shared memory block and lock.
+        """
+        return {'name': self._memory.name, 'capacity': self._capacity, 'typecode': self._typecode,
+                'with_ids': self._ids is not None, 'lock': self._lock}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Reattaches an unpickled heap to the shared memory block it refers to.
+        """
+        memory = shared_memory.SharedMemory(name=state['name'])
+        self._attach(memory, state['capacity'], state['typecode'], state['with_ids'], state['lock'])
+
+    def __str__(self) -> str:
+        """
+        Return SharedMinHeap content in human-readable form
+        """
+        with self._lock:
+            size = self.size()
+            if self._ids is None:
+                return "HEAP " + str(self._heap[:size].tolist())
+            return "HEAP " + str(list(zip(self._heap[:size].tolist(), self._ids[:size].tolist())))
+
+    def add(self, priority, item_id: int = None) -> None:
+        """
+        Adds new priority (and its payload id, if ids are enabled) to the heap in the appropriate place.
+        Raises MinHeapException if the heap is full.
+        """
+        if self._ids is not None and item_id is None:
+            raise MinHeapException('This heap stores payload ids, so item_id is required')
+
+        with self._lock:
+            size = self.size()
+            if size == self._capacity:
+                raise MinHeapException('SharedMinHeap is full')
+
+            self._heap[size] = priority
+            if self._ids is not None:
+                self._ids[size] = item_id
+            self._header[0] = size + 1
+            self._percolate_up(size)
+
+    def get_min(self):
+        """
+        Returns the minimum priority of the heap, or a (priority, id) tuple if ids are enabled.
+        """
+        with self._lock:
+            return super().get_min()
+
+    def remove_min(self):
+        """
+        Removes and returns the minimum priority of the heap, or a (priority, id) tuple if ids are enabled.
+        """
+        with self._lock:
+            min_value = super().get_min()
+
+            # Move the last entry to the root and sift it down over the shortened heap
+            last_index = self.size() - 1
+            self._header[0] = last_index
+            if last_index > 0:
+                self._heap[0] = self._heap[last_index]
+                if self._ids is not None:
+                    self._ids[0] = self._ids[last_index]
+                self._percolate_down(0)
+
+            return min_value
+
+    def build_heap(self, priorities, ids=None) -> None:
+        """
+        Replaces the heap with a new heap, built from the specified priorities (and ids) in O(n) time.
+        """
+        priorities = list(priorities)
+        if len(priorities) > self._capacity:
+            raise MinHeapException('SharedMinHeap is full')
+        if self._ids is not None:
+            if ids is None:
+                raise MinHeapException('This heap stores payload ids, so ids are required')
+            ids = list(ids)
+            if len(ids) != len(priorities):
+                raise MinHeapException('Priorities and ids must have the same length')
+
+        with self._lock:
+            self._heap[:len(priorities)] = self._typed(priorities, self._typecode)
+            if self._ids is not None:
+                self._ids[:len(ids)] = self._typed(ids, 'q')
+            self._header[0] = len(priorities)
+
+            # We sift down every non-leaf node, going up until we get to the root
+            for node_index in range((len(priorities) // 2) - 1, -1, -1):
+                self._percolate_down(node_index)
+
+    def size(self) -> int:
+        """
+        Returns the size of the heap.
+        """
+        return self._header[0]
+
+    def clear(self) -> None:
+        """
+        Clears the heap.
+        """
+        with self._lock:
+            self._header[0] = 0
+
+    def close(self) -> None:
+        """
+        Detaches this process from the shared memory block. The heap cannot be used afterwards.
+        """
+        # The views into the block have to be released before it can be closed
+        self._header.release()
+        self._heap.release()
+        if self._ids is not None:
+            self._ids.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory block once every process has closed it. Call from the creating process only.
+        """
+        self._memory.unlink()
+
+    def _attach(self, memory: shared_memory.SharedMemory, capacity: int, typecode: str,
+                with_ids: bool, lock) -> None:
+        """
+        Sets up typed views of the header, priorities and ids stored in the shared memory block.
+        """
+        self._memory = memory
+        self._capacity = capacity
+        self._typecode = typecode
+        self._lock = lock
+
+        ids_offset = _HEADER_SIZE + _ITEM_SIZE * capacity
+        self._header = memory.buf[:_HEADER_SIZE].cast('q')
+        self._heap = memory.buf[_HEADER_SIZE:ids_offset].cast(typecode)
+        self._ids = memory.buf[ids_offset:ids_offset + _ITEM_SIZE * capacity].cast('q') if with_ids else None
+
+    @staticmethod
+    def _typed(values: list, typecode: str) -> memoryview:
+        """
+        Returns the values packed into a buffer of the specified typecode, for slice assignment.
+        """
+        return memoryview(struct.pack(f'{len(values)}{typecode}', *values)).cast(typecode)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+def _worker(heap: SharedMinHeap, start: int) -> None:
+    """
+    Adds a few entries to the shared heap from a worker process.
+    """
+    for item_id in range(start, start + 5):
+        heap.add(float(item_id * 7 % 11), item_id)
+    heap.close()
+
+
+if __name__ == '__main__':
+
+    print("\nSharedMinHeap example 1")
+    print("-----------------------")
+    h = SharedMinHeap(capacity=100, with_ids=True)
+    workers = [multiprocessing.Process(target=_worker, args=(h, start)) for start in (0, 5, 10)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    print(h.size())
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+    h.close()
+    h.unlink()